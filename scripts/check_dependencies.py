@@ -3,140 +3,398 @@
 import os
 import sys
 import subprocess
-import json
 import re
-from typing import Dict, List
+import fnmatch
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
 from pathlib import Path
 import shutil
-from packaging import version
+import functools
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
 
+try:
+    import orjson as _json
+
+    def _dumps(obj) -> bytes:
+        return _json.dumps(obj, option=_json.OPT_INDENT_2)
+except ImportError:
+    import json as _json
+
+    def _dumps(obj) -> bytes:
+        return _json.dumps(obj, indent=2).encode('utf-8')
+
+# The sparse-checkout list in workflows/dependency-check.yml repeats these
+# names; nothing keeps them in sync, so update them together.
+PACKAGE_FILES = {
+    'package.json': 'npm',
+    'requirements.txt': 'pip',
+    'Pipfile': 'pipenv',
+    'composer.json': 'composer',
+    'pom.xml': 'maven',
+    'build.gradle': 'gradle',
+    'Gemfile': 'bundler',
+    'go.mod': 'go',
+    'Cargo.toml': 'cargo',
+    '*.csproj': 'dotnet'
+}
+
+RAW_GITHUB_URL = 'https://raw.githubusercontent.com/{owner}/{repo}/HEAD/{path}'
+GITHUB_CLONE_URL = 'https://github.com/{repo}.git'
+NPM_REGISTRY_URL = 'https://registry.npmjs.org/{name}'
+NPM_ABBREVIATED_ACCEPT = 'application/vnd.npm.install-v1+json'
+PYPI_URL = 'https://pypi.org/pypi/{name}/json'
+
+# GitHub owner/repository slug accepted by --repo
+REPO_RE = re.compile(r'^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$')
+
+EXACT_FILES = {name: manager for name, manager in PACKAGE_FILES.items() if '*' not in name}
+GLOB_PATTERNS = [(re.compile(fnmatch.translate(pattern)), manager)
+                 for pattern, manager in PACKAGE_FILES.items() if '*' in pattern]
+
+# Name, optional [extras], optional first version specifier. The lookahead
+# after the name rejects URL/VCS lines such as git+https://...
+REQUIREMENT_RE = re.compile(
+    r'^[ \t]*([A-Za-z0-9][A-Za-z0-9_.\-]*)(?=[ \t\r\[;@<>=!~#]|$)[ \t]*(?:\[[^\]\n]*\])?'
+    r'[ \t]*(?:([<>=!~]={0,2})[ \t]*([^\s;#,]+))?',
+    re.MULTILINE
+)
+
+# Directories that never hold the project's own manifests but can be huge
+PRUNE_DIRS = {'.git', 'node_modules', 'vendor', 'target', 'dist', 'build', '.venv'}
+
+# Paths a sparse checkout needs so that detect_package_managers sees every manifest
+MANIFEST_PATHS = tuple(PACKAGE_FILES)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+    'check_outdated', 'versions.sqlite'
+)
+DEFAULT_CACHE_TTL = 3600
+
+# Concurrent lookups per registry, and connections kept open per host
+REGISTRY_WORKERS = 16
+# Hosts the shared session keeps connection pools for
+CONNECTION_POOLS = 16
+MANIFEST_FETCH_WORKERS = 8
+
+class VersionCache:
+    """SQLite-backed cache of latest package versions, keyed by (manager, name)."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_CACHE_TTL):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pending = []
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS versions ('
+            'manager TEXT, name TEXT, latest TEXT, fetched_at REAL, '
+            'PRIMARY KEY(manager, name))'
+        )
+
+    def get(self, manager: str, name: str, ttl: Optional[float] = None) -> Optional[str]:
+        """Return the cached latest version, or None if missing or older than ttl."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT latest FROM versions WHERE manager = ? AND name = ? AND fetched_at >= ?',
+                (manager, name, time.time() - ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, manager: str, name: str, latest: str) -> None:
+        """Queue a lookup result; it is written to disk by close()."""
+        with self._lock:
+            self._pending.append((manager, name, latest, time.time()))
+
+    def close(self) -> None:
+        """Write all queued results in a single transaction and close the database."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany('INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?)', self._pending)
+            self._pending = []
+            self._conn.close()
+
+def lookup_latest(manager: str, pkg_name: str, fetch: Callable[[str], Optional[str]],
+                  cache: Optional[VersionCache] = None) -> Optional[str]:
+    """Return the latest version of a package, consulting the cache before the registry."""
+    if cache is not None:
+        latest_version = cache.get(manager, pkg_name)
+        if latest_version is not None:
+            return latest_version
+
+    latest_version = fetch(pkg_name)
+    if latest_version and cache is not None:
+        cache.put(manager, pkg_name, latest_version)
+    return latest_version
+
+@functools.lru_cache(maxsize=None)
 def is_tool_available(name: str) -> bool:
-    """Check if a command-line tool is available."""
+    """Check if a command-line tool is available (PATH is searched once per tool)."""
     return shutil.which(name) is not None
 
 def detect_package_managers(repo_dir: str) -> Dict[str, str]:
     """Detect package managers based on dependency files."""
-    package_files = {
-        'package.json': 'npm',
-        'requirements.txt': 'pip',
-        'Pipfile': 'pipenv',
-        'composer.json': 'composer',
-        'pom.xml': 'maven',
-        'build.gradle': 'gradle',
-        'Gemfile': 'bundler',
-        'go.mod': 'go',
-        'Cargo.toml': 'cargo',
-        '*.csproj': 'dotnet'
-    }
-
-    found_managers = {}
-    
-    for file_pattern, manager in package_files.items():
-        if '*' in file_pattern:
-            matches = list(Path(repo_dir).rglob(file_pattern.replace('*', '*')))
-            if matches:
-                found_managers[manager] = str(matches[0])
-        else:
-            file_path = os.path.join(repo_dir, file_pattern)
-            if os.path.exists(file_path):
-                found_managers[manager] = file_path
-
-    return found_managers
-
-def check_npm_packages(repo_dir: str) -> List[Dict]:
-    """Check NPM packages for updates."""
-    packages = []
-    if not is_tool_available('npm'):
-        return packages
+    # Exact manifest names only count at the repository root
+    with os.scandir(repo_dir) as entries:
+        found_managers = {EXACT_FILES[entry.name]: entry.path for entry in entries
+                          if entry.name in EXACT_FILES and entry.is_file()}
 
-    try:
-        with open(os.path.join(repo_dir, 'package.json'), 'r') as f:
-            pkg_data = json.load(f)
-            all_deps = {}
-            all_deps.update(pkg_data.get('dependencies', {}))
-            all_deps.update(pkg_data.get('devDependencies', {}))
-
-        for pkg_name, current_version in all_deps.items():
-            current_version = current_version.replace('^', '').replace('~', '')
-            try:
-                result = subprocess.run(
-                    ['npm', 'view', pkg_name, 'version'],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                latest_version = result.stdout.strip()
+    # Glob patterns match anywhere below it
+    pending = [(pattern, manager) for pattern, manager in GLOB_PATTERNS
+               if manager not in found_managers]
+    for root, dirs, files in os.walk(repo_dir):
+        if not pending:
+            break
+        dirs[:] = [d for d in dirs if d not in PRUNE_DIRS]
+        for file_name in files:
+            for pattern, manager in pending:
+                if manager not in found_managers and pattern.match(file_name):
+                    found_managers[manager] = os.path.join(root, file_name)
+        pending = [(pattern, manager) for pattern, manager in pending
+                   if manager not in found_managers]
+
+    # Keep PACKAGE_FILES order
+    return {manager: found_managers[manager] for manager in PACKAGE_FILES.values()
+            if manager in found_managers}
+
+@functools.lru_cache(maxsize=None)
+def get_session() -> requests.Session:
+    """Return the HTTP session shared by manifest and registry requests."""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=CONNECTION_POOLS, pool_maxsize=REGISTRY_WORKERS))
+    return session
+
+def fetch_manifests_http(owner: str, repo: str) -> Dict[str, bytes]:
+    """Fetch root-level dependency manifests of a GitHub repository over HTTPS.
+
+    Raises requests.RequestException if any manifest could not be fetched.
+    """
+    session = get_session()
+
+    def fetch(file_name: str):
+        url = RAW_GITHUB_URL.format(owner=owner, repo=repo, path=file_name)
+        response = session.get(url, timeout=10)
+        # Only 404 means the manifest does not exist
+        if response.status_code == 404:
+            return file_name, None
+        response.raise_for_status()
+        return file_name, response.content
+
+    # Glob patterns such as *.csproj cannot be resolved without a tree listing
+    file_names = [name for name in PACKAGE_FILES if '*' not in name]
+    with ThreadPoolExecutor(max_workers=MANIFEST_FETCH_WORKERS) as executor:
+        return {name: content for name, content in executor.map(fetch, file_names) if content is not None}
+
+def parse_npm_dependencies(content: str) -> Dict[str, str]:
+    """Parse dependencies and devDependencies from package.json content."""
+    pkg_data = _json.loads(content)
+    all_deps = {}
+    all_deps.update(pkg_data.get('dependencies', {}))
+    all_deps.update(pkg_data.get('devDependencies', {}))
+    return {name: ver.replace('^', '').replace('~', '') for name, ver in all_deps.items()}
+
+def parse_python_requirements(content: str) -> Dict[str, str]:
+    """Parse package names and pinned versions from requirements.txt content."""
+    # Join backslash continuations first, as pip does
+    content = re.sub(r'\\\r?\n', ' ', content)
+    return {match.group(1): match.group(3) or "Not specified"
+            for match in REQUIREMENT_RE.finditer(content)}
+
+def check_latest_versions(manager: str, dependencies: Dict[str, str],
+                          fetch: Callable[[str], Optional[str]],
+                          cache: Optional[VersionCache] = None) -> List[Dict]:
+    """Look up the latest version of each dependency concurrently."""
+    packages = []
+    with ThreadPoolExecutor(max_workers=REGISTRY_WORKERS) as executor:
+        latest_versions = executor.map(
+            lambda pkg_name: lookup_latest(manager, pkg_name, fetch, cache),
+            dependencies
+        )
+        for (pkg_name, current_version), latest_version in zip(dependencies.items(), latest_versions):
+            if latest_version:
                 packages.append({
                     'name': pkg_name,
                     'current': current_version,
                     'latest': latest_version
                 })
-            except subprocess.CalledProcessError:
-                continue
+    return packages
+
+def fetch_npm_latest(pkg_name: str) -> Optional[str]:
+    """Return the latest published version of a package from the npm registry."""
+    try:
+        # Scoped packages are requested as @scope%2Fname
+        url = NPM_REGISTRY_URL.format(name=pkg_name.replace('/', '%2F'))
+        response = get_session().get(url, headers={'Accept': NPM_ABBREVIATED_ACCEPT}, timeout=5)
+        if response.status_code != 200:
+            return None
+        return _json.loads(response.content)['dist-tags']['latest']
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return None
 
+def check_npm_packages(content: str, cache: Optional[VersionCache] = None) -> List[Dict]:
+    """Check NPM packages for updates."""
+    try:
+        return check_latest_versions('npm', parse_npm_dependencies(content), fetch_npm_latest, cache)
     except Exception as e:
         print(f"Error checking NPM packages: {e}")
+        return []
 
-    return packages
+def fetch_pypi_latest(pkg_name: str) -> Optional[str]:
+    """Return the latest released version of a package from the PyPI JSON API."""
+    try:
+        response = get_session().get(PYPI_URL.format(name=pkg_name), timeout=5)
+        if response.status_code != 200:
+            return None
+        return _json.loads(response.content)['info']['version']
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return None
 
-def check_pip_packages(requirements_path: str) -> List[Dict]:
+def check_pip_packages(content: str, cache: Optional[VersionCache] = None) -> List[Dict]:
     """Check Python packages for updates."""
-    packages = []
-    if not os.path.exists(requirements_path):
-        return packages
-
     try:
-        with open(requirements_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Parse requirement line
-                    match = re.match(r'^([^=<>]+)(==|>=|<=|~=|!=|<|>)?(.+)?', line)
-                    if match:
-                        pkg_name = match.group(1).strip()
-                        current_version = match.group(3).strip() if match.group(3) else "Not specified"
-                        
-                        try:
-                            result = subprocess.run(
-                                ['pip', 'index', 'versions', pkg_name],
-                                capture_output=True,
-                                text=True,
-                                check=True
-                            )
-                            versions = re.findall(r'\d+\.\d+\.\d+', result.stdout)
-                            if versions:
-                                latest_version = max(versions, key=lambda x: version.parse(x))
-                                packages.append({
-                                    'name': pkg_name,
-                                    'current': current_version,
-                                    'latest': latest_version
-                                })
-                        except subprocess.CalledProcessError:
-                            continue
-
+        return check_latest_versions('pip', parse_python_requirements(content), fetch_pypi_latest, cache)
     except Exception as e:
         print(f"Error checking pip packages: {e}")
+        return []
 
-    return packages
+# Add more package manager checks as needed
+PACKAGE_CHECKERS = {
+    'npm': check_npm_packages,
+    'pip': check_pip_packages,
+}
+
+def run_git(*args: str) -> None:
+    """Run a git command, discarding stdout; git's own errors go straight to stderr."""
+    subprocess.run(['git', *args], stdout=subprocess.DEVNULL, check=True)
+
+def git_output(*args: str) -> str:
+    """Run a git command and return its stripped stdout, or '' if it fails."""
+    result = subprocess.run(['git', *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return result.stdout.decode().strip() if result.returncode == 0 else ''
+
+def check_workdir_reusable(workdir: str, clone_url: str) -> None:
+    """Refuse to reset a checkout that is not a clean sparse clone of clone_url."""
+    origin_url = git_output('-C', workdir, 'remote', 'get-url', 'origin')
+    if origin_url != clone_url:
+        raise RuntimeError(f'{workdir} is a checkout of {origin_url or "an unknown remote"}, not {clone_url}')
+    # Checkouts created by sync_workdir are sparse
+    if git_output('-C', workdir, 'config', '--bool', 'core.sparseCheckout') != 'true':
+        raise RuntimeError(f'{workdir} was not created by this tool (not a sparse checkout)')
+    if git_output('-C', workdir, 'status', '--porcelain'):
+        raise RuntimeError(f'{workdir} has local changes; refusing to reset it')
+
+def sync_workdir(workdir: str, repo: str) -> None:
+    """Update a persistent checkout in place, or create it as a sparse clone of repo."""
+    clone_url = GITHUB_CLONE_URL.format(repo=repo)
+    if os.path.isdir(os.path.join(workdir, '.git')):
+        check_workdir_reusable(workdir, clone_url)
+        run_git('-C', workdir, 'fetch', '--depth', '1', 'origin', 'HEAD')
+        run_git('-C', workdir, 'reset', '--hard', 'FETCH_HEAD')
+        return
+
+    # Blob-less clone, sparse-checked-out to the manifests only
+    sparse_patterns = [path if '*' in path else '/' + path for path in MANIFEST_PATHS]
+    run_git('clone', '--depth', '1', '--filter=blob:none', '--no-checkout', clone_url, workdir)
+    run_git('-C', workdir, 'sparse-checkout', 'set', '--no-cone', *sparse_patterns)
+    run_git('-C', workdir, 'checkout')
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Check dependency files for outdated packages.')
+    parser.add_argument('--repo', metavar='OWNER/NAME',
+                        help='read manifests of this GitHub repository over HTTPS instead of the working directory')
+    parser.add_argument('--workdir', metavar='DIR',
+                        help='persistent checkout of --repo to update with a shallow fetch instead of re-downloading')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL, metavar='SECONDS',
+                        help=f'reuse cached latest versions younger than this (default: {DEFAULT_CACHE_TTL})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always query the registries and skip the version cache')
+    args = parser.parse_args()
+    if args.cache_ttl < 0:
+        parser.error('--cache-ttl must not be negative')
+    if args.repo and not REPO_RE.match(args.repo):
+        parser.error(f'--repo must be OWNER/NAME, got {args.repo!r}')
+    if args.workdir and not is_tool_available('git'):
+        parser.error('--workdir requires git')
+    if args.workdir and not args.repo:
+        parser.error('--workdir requires --repo')
+    return args
 
 def main():
-    repo_dir = os.getcwd()
+    args = parse_args()
     results = {}
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = VersionCache(ttl=args.cache_ttl)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: version cache unavailable, querying registries directly: {e}")
     
-    # Detect package managers
-    package_managers = detect_package_managers(repo_dir)
+    if args.repo and not args.workdir:
+        # Fetch manifests directly from GitHub, no checkout required
+        owner, repo = args.repo.split('/', 1)
+        try:
+            manifests = fetch_manifests_http(owner, repo)
+        except requests.RequestException as e:
+            sys.exit(f"Error fetching manifests from GitHub: {e}")
+        if not manifests:
+            # Every path of a missing or private repository is a 404
+            sys.exit(f"Error: no dependency manifests found in {args.repo} "
+                     "(repository missing, private or without root-level manifests)")
+        package_managers = {PACKAGE_FILES[name]: name for name in manifests}
+
+        def read_manifest(file_path: str) -> str:
+            return manifests[file_path].decode('utf-8')
+    else:
+        if args.workdir:
+            try:
+                sync_workdir(args.workdir, args.repo)
+            except (RuntimeError, subprocess.CalledProcessError) as e:
+                sys.exit(f"Error preparing --workdir: {e}")
+
+        # Detect package managers
+        package_managers = detect_package_managers(args.workdir or os.getcwd())
+
+        def read_manifest(file_path: str) -> str:
+            return Path(file_path).read_text()
     
     # Check packages for each detected package manager
-    for manager, file_path in package_managers.items():
-        if manager == 'npm':
-            results['npm'] = check_npm_packages(repo_dir)
-        elif manager == 'pip':
-            results['pip'] = check_pip_packages(file_path)
-        # Add more package manager checks as needed
+    def run_check(manager: str, file_path: str) -> List[Dict]:
+        try:
+            content = read_manifest(file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading {file_path}: {e}")
+            return []
+        return PACKAGE_CHECKERS[manager](content, cache)
+
+    checks = {manager: file_path for manager, file_path in package_managers.items()
+              if manager in PACKAGE_CHECKERS}
+    if len(checks) == 1:
+        (manager, file_path), = checks.items()
+        results = {manager: run_check(manager, file_path)}
+    elif checks:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {
+                manager: executor.submit(run_check, manager, file_path)
+                for manager, file_path in checks.items()
+            }
+        # Collect in detection order
+        results = {manager: future.result() for manager, future in futures.items()}
     
+    if cache is not None:
+        try:
+            cache.close()
+        except sqlite3.Error as e:
+            print(f"Warning: could not update version cache: {e}")
+
     # Write results to a JSON file
-    with open('dependency-report.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    with open('dependency-report.json', 'wb') as f:
+        f.write(_dumps(results))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
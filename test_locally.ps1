@@ -1,5 +1,5 @@
 # Install required Python packages
-pip install requests packaging
+pip install requests
 
 # Run the dependency checker
 python .github/scripts/check_dependencies.py
@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from check_dependencies import parse_python_requirements
+
+
+def test_parse_python_requirements():
+    content = '\n'.join([
+        '# comment',
+        'requests==2.26.0',
+        'django[bcrypt]>=3.2',
+        'flask ; python_version >= "3.8"',
+        'numpy>=1,<2',
+        'pytest  # test runner',
+        'urllib3 @ https://example.com/urllib3.tar.gz',
+        'idna==3.4 \\',
+        '    --hash=sha256:abc',
+        '-r other.txt',
+        '-e git+https://github.com/psf/black.git#egg=black',
+        '--index-url https://pypi.example.com/simple',
+        'git+https://github.com/psf/requests.git#egg=requests',
+        'https://example.com/pkg.tar.gz',
+        '',
+    ])
+
+    assert parse_python_requirements(content) == {
+        'requests': '2.26.0',
+        'django': '3.2',
+        'flask': 'Not specified',
+        'numpy': '1',
+        'pytest': 'Not specified',
+        'urllib3': 'Not specified',
+        'idna': '3.4',
+    }